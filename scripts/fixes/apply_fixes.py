@@ -0,0 +1,528 @@
+#!/usr/bin/env python3
+"""Consolidated codemod driver for the one-off TypeScript fixer scripts.
+
+This replaces the pile of single-purpose fixers (comprehensive-fix.py,
+fix-error-handler-final.py, fix-error-handler-syntax.py, fix-event-emitter.py,
+fix-nubi-character.py, fix-nubi-final.py, fix-pattern-order.py,
+fix-raid-system.py, fix-security-filter.py, fix-spam-detection.py,
+fix-templates.py) that each re-read and re-wrote the same TypeScript files.
+Running them back-to-back paid ~20 redundant open/read/write cycles for
+error-handler.ts and security-filter.ts alone.
+
+Here every target file is read exactly once, all of its transformations are
+applied in memory in order, and it is written back exactly once.  Each
+transform is idempotent: running the driver against an already-fixed tree
+leaves the files byte-identical.
+
+Usage:
+    python scripts/fixes/apply_fixes.py
+"""
+
+import io
+import mmap
+import os
+from concurrent.futures import ThreadPoolExecutor
+import re
+import sys
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Callable, List, Tuple
+
+if __package__:
+    from . import content_store
+else:  # run directly: python scripts/fixes/apply_fixes.py
+    import content_store
+
+# tree-sitter gives an exact AST span for the templates block; without it
+# fix_templates refuses to splice rather than guess at brace depth.
+try:
+    from tree_sitter import Language, Parser
+    import tree_sitter_typescript
+
+    _TS_LANGUAGE = Language(tree_sitter_typescript.language_typescript())
+    try:
+        _TS_PARSER = Parser(_TS_LANGUAGE)
+    except TypeError:  # pre-0.22 tree_sitter API
+        _TS_PARSER = Parser()
+        _TS_PARSER.set_language(_TS_LANGUAGE)
+except ImportError:
+    _TS_PARSER = None
+
+ROOT = Path(__file__).resolve().parents[2]
+
+DEBUG = bool(os.environ.get("FIXES_DEBUG"))
+
+
+@dataclass
+class FileTransform:
+    """A target file (relative to the repo root) and the ordered list of
+    content transformations to apply to it.
+
+    `scan` is an optional tuple of byte needles covering every anchor the
+    transforms react to; if none occur in the file, the driver skips the
+    read/decode/transform/write cycle entirely.  Leave it empty for files
+    whose transforms have no cheap literal anchor."""
+
+    path: str
+    transforms: List[Callable[[str], str]]
+    scan: Tuple[bytes, ...] = ()
+
+
+def needs_fixing(path: Path, needles: Tuple[bytes, ...]) -> bool:
+    """Scan `path` for any of `needles` via a read-only memory map.
+
+    The kernel faults pages in on demand (no userspace buffer copy) and
+    mm.find is a C-level search, so files that are already clean are
+    rejected without ever materializing their content in Python."""
+    with open(path, "rb") as f:
+        size = os.fstat(f.fileno()).st_size
+        if size == 0:
+            return False
+        mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        try:
+            if hasattr(mm, "madvise"):
+                mm.madvise(mmap.MADV_SEQUENTIAL)
+            return any(mm.find(needle) != -1 for needle in needles)
+        finally:
+            mm.close()
+
+
+# ---------------------------------------------------------------------------
+# error-handler.ts (from comprehensive-fix.py, fix-error-handler-final.py,
+# fix-error-handler-syntax.py, fix-event-emitter.py)
+# ---------------------------------------------------------------------------
+
+# Patterns are compiled once at import time.  re's internal cache holds only
+# ~512 entries and recompiles on eviction, so per-call re.sub with string
+# literals pays compile cost every time the cache rolls over.
+_PAT_EVENT_EMIT = re.compile(r"runtime\.emit\(")
+_PAT_EVENT_ON = re.compile(r"runtime\.on\(")
+_PAT_EVENT_OFF = re.compile(r"runtime\.off\(")
+# Bounded capture for the logger-metadata pass: the old DOTALL `.*?`
+# version had no anchor after the literal prefix, so absent matches made
+# the engine re-expand non-greedy states across the rest of the file
+# (O(N^2) worst case). Negated character classes still span newlines but
+# cannot cross a brace boundary, keeping the scan linear.
+_PAT_LOGGER_META = re.compile(
+    r"logger\.(error|warn|info)\(([^{]*?)\{([^}]+)\}\)"
+)
+_PAT_SPAM_WARN_THRESHOLD = re.compile(r"spamWarnThreshold:\s*\d+,")
+
+LOG_ERROR_BODY = """\
+  private static logError(error: ServiceError): void {
+    logger.error(
+      `[${error.service}] ${error.method} failed: ${error.error.message}`,
+      JSON.stringify({
+        stack: error.error.stack,
+        context: error.context,
+        correlationId: error.correlationId,
+      }),
+    );
+  }
+"""
+
+
+_PAT_LOG_ERROR = re.compile(
+    r"  private static logError\(error: ServiceError\): void \{.*?\n  \}\n",
+    re.DOTALL,
+)
+
+
+def fix_error_handler_log_error(content: str) -> str:
+    """Replace the body of ServiceErrorHandler.logError with the structured
+    format (ported from fix-error-handler-final.py).
+
+    A single anchored substitution; the old per-line state machine could
+    desync its skip counter on reformatted input."""
+    if "private static logError" not in content:
+        return content
+    return _PAT_LOG_ERROR.sub(lambda m: LOG_ERROR_BODY, content, count=1)
+
+
+# Sequential str.replace calls each walk the whole string and allocate a new
+# one; fusing the literals into one alternation regex keeps it to a single
+# O(N) scan and a single allocation.
+_SYNTAX_REPLACEMENTS = {
+    ";;": ";",
+    ",,": ",",
+    ") ;": ");",
+}
+_PAT_SYNTAX = re.compile("|".join(re.escape(k) for k in _SYNTAX_REPLACEMENTS))
+
+
+def fix_error_handler_syntax(content: str) -> str:
+    """Clean up mechanical syntax damage left by earlier fixers
+    (ported from fix-error-handler-syntax.py)."""
+    if not any(needle in content for needle in _SYNTAX_REPLACEMENTS):
+        return content
+    return _PAT_SYNTAX.sub(lambda m: _SYNTAX_REPLACEMENTS[m.group(0)], content)
+
+
+# Line patches from comprehensive-fix.py (0-based indices into
+# error-handler.ts); the values are the known-good lines.
+ERROR_HANDLER_LINE_PATCHES = {
+    33: "      logger.debug(\n",
+    36: "      const result = await fn();\n",
+    106: "          logger.error(\n",
+}
+
+
+def fix_error_handler_lines(content: str) -> str:
+    """Patch the known line indices in one forward scan.
+
+    Streams over newline offsets instead of materializing a list of line
+    objects (the old readlines + lines[i] = ... approach allocated ~200
+    strings per run to touch three of them); untouched spans are copied
+    through as whole slices into a single growable StringIO buffer."""
+    buf = io.StringIO()
+    dirty = False
+    cut = 0  # start of the not-yet-emitted span
+    pos = 0  # current scan offset
+    line_no = 0
+    for index in sorted(ERROR_HANDLER_LINE_PATCHES):
+        while line_no < index:
+            nl = content.find("\n", pos)
+            if nl == -1:
+                break
+            pos = nl + 1
+            line_no += 1
+        if line_no != index:
+            break  # patch index beyond EOF
+        nl = content.find("\n", pos)
+        line_end = len(content) if nl == -1 else nl + 1
+        replacement = ERROR_HANDLER_LINE_PATCHES[index]
+        if content[pos:line_end] != replacement:
+            buf.write(content[cut:pos])
+            buf.write(replacement)
+            dirty = True
+            cut = line_end
+        pos = line_end
+        line_no += 1
+    if not dirty:
+        return content
+    buf.write(content[cut:])
+    return buf.getvalue()
+
+
+def _logger_meta_repl(match: re.Match) -> str:
+    # Only rewrite bare object-literal metadata: leave template literals,
+    # already-converted calls, and spans that crossed a statement boundary
+    # alone.
+    if any(tok in match.group(0) for tok in ("${", "JSON.stringify", ";", "`")):
+        return match.group(0)
+    return "logger.%s(%sJSON.stringify({%s}))" % (
+        match.group(1),
+        match.group(2),
+        match.group(3),
+    )
+
+
+def fix_event_emitter(content: str) -> str:
+    """Route bare runtime event calls through the eventEmitter service and
+    stringify object metadata passed to the logger (ported from
+    fix-event-emitter.py)."""
+    # str.__contains__ is a C-level substring scan; cheaper than running the
+    # regex engine over files that never mention the pattern (the common
+    # case: only one target file has runtime event calls).
+    if "runtime.emit(" in content:
+        content = _PAT_EVENT_EMIT.sub(
+            'runtime.services.get("eventEmitter")?.emit(', content
+        )
+    if "runtime.on(" in content:
+        content = _PAT_EVENT_ON.sub(
+            'runtime.services.get("eventEmitter")?.on(', content
+        )
+    if "runtime.off(" in content:
+        content = _PAT_EVENT_OFF.sub(
+            'runtime.services.get("eventEmitter")?.off(', content
+        )
+    if "logger." in content:
+        content = _PAT_LOGGER_META.sub(_logger_meta_repl, content)
+    return content
+
+
+# ---------------------------------------------------------------------------
+# security-filter.ts (from fix-security-filter.py, fix-spam-detection.py,
+# fix-pattern-order.py)
+# ---------------------------------------------------------------------------
+
+
+def fix_security_filter(content: str) -> str:
+    """Tighten the overly broad secret-detection patterns that flagged any
+    message containing 'key' or 'token' (ported from fix-security-filter.py)."""
+    content = content.replace(
+        r"/\b(key|secret|token|password)\b/i,",
+        r"/\b(api\s*key|secret[_\s]*key|private\s*key|access\s*token|bearer\s*token)\b/i,",
+    )
+    return content
+
+
+def fix_spam_detection(content: str) -> str:
+    """Make the warn threshold configurable instead of hard-coded
+    (ported from fix-spam-detection.py)."""
+    content = content.replace(
+        "const warnAt = blockAt - 1;",
+        "const warnAt = this.config.spamWarnThreshold ?? Math.max(5, blockAt - 1);",
+    )
+    content = _PAT_SPAM_WARN_THRESHOLD.sub("spamWarnThreshold: 5,", content)
+    return content
+
+
+def fix_pattern_order(content: str) -> str:
+    """Check the cheap literal injection patterns before the broad
+    system-prompt pattern (ported from fix-pattern-order.py)."""
+    content = content.replace(
+        "      /system.*prompt/i,\n      /ignore.*previous.*instructions?/i,",
+        "      /ignore.*previous.*instructions?/i,\n      /system.*prompt/i,",
+    )
+    return content
+
+
+# ---------------------------------------------------------------------------
+# nubi-character.ts (from fix-templates.py, fix-nubi-character.py,
+# fix-nubi-final.py)
+# ---------------------------------------------------------------------------
+
+
+_TEMPLATES_ANCHOR = b"  templates: {"
+
+
+def _templates_span_ast(data: bytes):
+    """Byte span of the top-level `templates: { ... }` pair, from the
+    TypeScript grammar.  Immune to braces inside template literals and
+    comments (the character file has `{{agentName}}` placeholders)."""
+    tree = _TS_PARSER.parse(data)
+    stack = [tree.root_node]
+    while stack:
+        node = stack.pop()
+        if node.type == "pair" and node.start_point[1] == 2:
+            key = node.child_by_field_name("key")
+            if key is not None and data[key.start_byte : key.end_byte] == b"templates":
+                return node.start_byte, node.end_byte
+        stack.extend(node.children)
+    return None
+
+
+def fix_templates(content: str) -> str:
+    """Drop the legacy inline `templates: { ... }` block; templates now live
+    with the response generator (ported from fix-templates.py).
+
+    Requires tree-sitter: a brace-depth scan miscounts inside template
+    literals (the block carries `{{agentName}}` placeholders in backtick
+    strings), so splicing on such a span would corrupt the file.  Without
+    the parser the transform warns and leaves the file untouched."""
+    data = content.encode("utf-8")
+    if _TEMPLATES_ANCHOR not in data:
+        return content
+    if _TS_PARSER is None:
+        print(
+            "Skipping templates block: install tree_sitter and "
+            "tree_sitter_typescript to remove it safely",
+            file=sys.stderr,
+        )
+        return content
+
+    span = _templates_span_ast(data)
+    if span is None:
+        return content
+    start, end = span
+
+    # Take the leading indentation and the trailing comma and newline with
+    # the block so no blank line is left behind.
+    line_start = data.rfind(b"\n", 0, start) + 1
+    if not data[line_start:start].strip():
+        start = line_start
+    if data.startswith(b",", end):
+        end += 1
+    if data.startswith(b"\n", end):
+        end += 1
+    return (data[:start] + data[end:]).decode("utf-8")
+
+
+def _debug_print_lines(content: str, first: int, last: int) -> None:
+    """Print lines [first, last] by scanning newline offsets.
+
+    Avoids content.split('\\n'), which materializes every line in the file
+    as its own string object just to look at a 25-line window."""
+    offset = 0
+    for _ in range(first):
+        nl = content.find("\n", offset)
+        if nl == -1:
+            return
+        offset = nl + 1
+    for i in range(first, last + 1):
+        nl = content.find("\n", offset)
+        end = len(content) if nl == -1 else nl
+        print(f"{i}: {content[offset:end]}")
+        if nl == -1:
+            return
+        offset = nl + 1
+
+
+def fix_nubi_character(content: str) -> str:
+    """Spread the MCP config into the character settings
+    (ported from fix-nubi-character.py / fix-nubi-final.py)."""
+    if DEBUG:
+        _debug_print_lines(content, 465, 490)
+    content = content.replace(
+        "  settings: {\n    secrets: {},\n  },\n",
+        "  settings: {\n    secrets: {},\n    ...nubiMcpConfig.settings,\n  },\n",
+    )
+    return content
+
+
+# ---------------------------------------------------------------------------
+# raid-tracker.ts (from fix-raid-system.py; the file was called
+# nubi-raid-system.ts before the telegram-raids split)
+# ---------------------------------------------------------------------------
+
+
+_RAID_REPLACEMENTS = {
+    "quote: number;": "quote: number;\n        view: number;",
+    ".raw(": ".rpc(",
+    ".userId": '.user?.id || ""',
+    '"user":': '"userId":',
+}
+_PAT_RAID = re.compile("|".join(re.escape(k) for k in _RAID_REPLACEMENTS))
+
+# An Aho-Corasick automaton matches every literal simultaneously in one
+# linear scan; the compiled alternation regex stays as the fallback when
+# pyahocorasick is not installed.
+try:
+    import ahocorasick
+
+    _RAID_AUTOMATON = ahocorasick.Automaton()
+    for _needle, _repl in _RAID_REPLACEMENTS.items():
+        _RAID_AUTOMATON.add_word(_needle, (_needle, _repl))
+    _RAID_AUTOMATON.make_automaton()
+except ImportError:
+    _RAID_AUTOMATON = None
+
+
+def fix_raid_system(content: str) -> str:
+    """Align the raid tracker with the current engagement schema
+    (ported from fix-raid-system.py)."""
+    if not any(needle in content for needle in _RAID_REPLACEMENTS):
+        return content
+    has_view = "view: number;" in content
+
+    def replacement_for(needle: str) -> str:
+        if needle == "quote: number;" and has_view:
+            return needle
+        return _RAID_REPLACEMENTS[needle]
+
+    if _RAID_AUTOMATON is None:
+        return _PAT_RAID.sub(lambda m: replacement_for(m.group(0)), content)
+
+    # StringIO grows a single C buffer instead of a list of PyObject*
+    # slices that "".join would re-walk.
+    buf = io.StringIO()
+    cut = 0
+    for end, (needle, _) in _RAID_AUTOMATON.iter(content):
+        start = end - len(needle) + 1
+        if start < cut:
+            continue  # overlaps a span already replaced
+        buf.write(content[cut:start])
+        buf.write(replacement_for(needle))
+        cut = end + 1
+    buf.write(content[cut:])
+    return buf.getvalue()
+
+
+# ---------------------------------------------------------------------------
+# Driver
+# ---------------------------------------------------------------------------
+
+FILE_TRANSFORMS = [
+    FileTransform(
+        "src/utils/error-handler.ts",
+        [
+            fix_error_handler_log_error,
+            fix_error_handler_syntax,
+            fix_error_handler_lines,
+            fix_event_emitter,
+        ],
+    ),
+    FileTransform(
+        "src/services/security-filter.ts",
+        [
+            fix_security_filter,
+            fix_spam_detection,
+            fix_pattern_order,
+        ],
+    ),
+    FileTransform(
+        "src/character/nubi-character.ts",
+        [
+            fix_templates,
+            fix_nubi_character,
+        ],
+        scan=(
+            b"  templates: {",
+            b"  settings: {\n    secrets: {},\n  },",
+        ),
+    ),
+    FileTransform(
+        "src/telegram-raids/raid-tracker.ts",
+        [
+            fix_raid_system,
+            fix_event_emitter,
+        ],
+    ),
+]
+
+
+def existing_targets() -> set:
+    """Existence set for all target files, built with one os.scandir per
+    distinct parent directory instead of one stat syscall per target."""
+    found = set()
+    for directory in {(ROOT / ft.path).parent for ft in FILE_TRANSFORMS}:
+        if directory.is_dir():
+            with os.scandir(directory) as entries:
+                found.update(Path(entry.path) for entry in entries)
+    return found
+
+
+def process_file(ft: FileTransform, existing: set) -> str:
+    """Run one file's read/transform/write cycle and return a status line."""
+    path = ROOT / ft.path
+    if path not in existing:
+        return f"Skipped (missing): {ft.path}"
+    if ft.scan and not needs_fixing(path, ft.scan):
+        return f"Clean: {ft.path}"
+    original = content = content_store.load(path)
+    for fn in ft.transforms:
+        content = fn(content)
+    # Writing identical content back would still bump the inode mtime and
+    # set off any watchers (nodemon, tsc --watch) into a spurious rebuild;
+    # the store's dirty check reduces the no-op case to a memcmp.
+    if content != original and content_store.save(path, content):
+        return f"Fixed: {ft.path}"
+    return f"Unchanged: {ft.path}"
+
+
+def apply() -> List[str]:
+    """Run every configured transform once and return the status lines.
+
+    Importable entry point: callers that chain codemods (CI steps, build
+    hooks) should import and call this instead of spawning a fresh
+    interpreter per script, which pays ~30-60ms startup plus cold regex
+    compiles and an empty content cache each time."""
+    # Files are independent and the work is I/O-bound (read -> regex ->
+    # write); a thread pool overlaps the disk waits since the GIL is
+    # released during file I/O.  ex.map preserves output order.
+    existing = existing_targets()
+    with ThreadPoolExecutor(max_workers=8) as ex:
+        return list(
+            ex.map(lambda ft: process_file(ft, existing), FILE_TRANSFORMS)
+        )
+
+
+def main() -> int:
+    for line in apply():
+        print(line)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,178 @@
+/**
+ * AST codemod for the TypeScript fixer transforms.
+ *
+ * Long-term replacement for the regex passes in apply_fixes.py: ts-morph
+ * walks the same AST the compiler builds, so transforms cannot be confused
+ * by template literals, comments, or formatting the way substring patterns
+ * can. Idempotent — running against an already-fixed tree writes nothing.
+ *
+ * Usage: bun scripts/fixes/codemod.ts (or: npx tsx scripts/fixes/codemod.ts)
+ */
+
+import {
+  Project,
+  PropertyAccessExpression,
+  SourceFile,
+  SyntaxKind,
+} from "ts-morph";
+
+const EVENT_METHODS = new Set(["emit", "on", "off"]);
+
+/** Route bare `runtime.emit/on/off(...)` through the eventEmitter service. */
+function fixRuntimeEventCalls(sourceFile: SourceFile): number {
+  const accesses = sourceFile
+    .getDescendantsOfKind(SyntaxKind.PropertyAccessExpression)
+    .filter(
+      (access) =>
+        EVENT_METHODS.has(access.getName()) &&
+        access.getExpression().getText() === "runtime" &&
+        access.getParentIfKind(SyntaxKind.CallExpression) !== undefined,
+    );
+  for (const access of accesses.reverse()) {
+    access
+      .getExpression()
+      .replaceWithText('runtime.services.get("eventEmitter")?');
+  }
+  return accesses.length;
+}
+
+/** Rename `.raw(...)` query calls to `.rpc(...)`. */
+function fixRawCalls(sourceFile: SourceFile): number {
+  const accesses = sourceFile
+    .getDescendantsOfKind(SyntaxKind.PropertyAccessExpression)
+    .filter(
+      (access) =>
+        access.getName() === "raw" &&
+        access.getParentIfKind(SyntaxKind.CallExpression) !== undefined,
+    );
+  for (const access of accesses.reverse()) {
+    access.getNameNode().replaceWithText("rpc");
+  }
+  return accesses.length;
+}
+
+/**
+ * True when the access is written rather than read: an assignment target,
+ * a `++`/`--` operand, or a `delete` operand. Rewriting those to the
+ * `?? ""` expression would produce an invalid assignment target.
+ */
+function isWritePosition(access: PropertyAccessExpression): boolean {
+  const parent = access.getParent();
+  if (!parent) return false;
+  if (parent.isKind(SyntaxKind.BinaryExpression)) {
+    const operator = parent.getOperatorToken().getKind();
+    return (
+      parent.getLeft() === access &&
+      operator >= SyntaxKind.FirstAssignment &&
+      operator <= SyntaxKind.LastAssignment
+    );
+  }
+  if (
+    parent.isKind(SyntaxKind.PostfixUnaryExpression) ||
+    parent.isKind(SyntaxKind.PrefixUnaryExpression)
+  ) {
+    const operator = parent.getOperatorToken();
+    return (
+      operator === SyntaxKind.PlusPlusToken ||
+      operator === SyntaxKind.MinusMinusToken
+    );
+  }
+  return parent.isKind(SyntaxKind.DeleteExpression);
+}
+
+/** Replace `.userId` reads with the optional-chained `.user?.id ?? ""`. */
+function fixUserIdAccess(sourceFile: SourceFile): number {
+  const accesses = sourceFile
+    .getDescendantsOfKind(SyntaxKind.PropertyAccessExpression)
+    .filter(
+      (access) => access.getName() === "userId" && !isWritePosition(access),
+    );
+  for (const access of accesses.reverse()) {
+    access.replaceWithText(
+      `(${access.getExpression().getText()}.user?.id ?? "")`,
+    );
+  }
+  return accesses.length;
+}
+
+/** Rename quoted `"user":` object keys to `"userId":`. */
+function fixUserKeys(sourceFile: SourceFile): number {
+  const assignments = sourceFile
+    .getDescendantsOfKind(SyntaxKind.PropertyAssignment)
+    .filter((assignment) => assignment.getNameNode().getText() === '"user"');
+  for (const assignment of assignments.reverse()) {
+    assignment.getNameNode().replaceWithText('"userId"');
+  }
+  return assignments.length;
+}
+
+/** Add the `view: number;` member next to `quote: number;` where missing. */
+function fixEngagementView(sourceFile: SourceFile): number {
+  let changes = 0;
+  const quoteProps = sourceFile
+    .getDescendantsOfKind(SyntaxKind.PropertySignature)
+    .filter((prop) => prop.getName() === "quote");
+  for (const prop of quoteProps) {
+    const container =
+      prop.getParentIfKind(SyntaxKind.InterfaceDeclaration) ??
+      prop.getParentIfKind(SyntaxKind.TypeLiteral);
+    if (!container) continue;
+    const members = container.getMembers();
+    const hasView = members.some(
+      (member) =>
+        member.asKind(SyntaxKind.PropertySignature)?.getName() === "view",
+    );
+    if (!hasView) {
+      container.insertMember(members.indexOf(prop) + 1, "view: number;");
+      changes++;
+    }
+  }
+  return changes;
+}
+
+// Transforms stay scoped per file, mirroring the apply_fixes.py driver:
+// the raid-tracker renames must not touch unrelated userId usage elsewhere.
+const TARGETS: Array<[string, Array<(sourceFile: SourceFile) => number>]> = [
+  ["src/utils/error-handler.ts", [fixRuntimeEventCalls]],
+  ["src/services/security-filter.ts", [fixRuntimeEventCalls]],
+  ["src/character/nubi-character.ts", []],
+  [
+    "src/telegram-raids/raid-tracker.ts",
+    [
+      fixRuntimeEventCalls,
+      fixRawCalls,
+      fixUserIdAccess,
+      fixUserKeys,
+      fixEngagementView,
+    ],
+  ],
+];
+
+function main(): number {
+  const project = new Project({
+    tsConfigFilePath: "tsconfig.json",
+    // The transforms are syntactic; skip loading the full program.
+    skipAddingFilesFromTsConfig: true,
+  });
+
+  for (const [path, transforms] of TARGETS) {
+    const sourceFile = project.addSourceFileAtPathIfExists(path);
+    if (!sourceFile) {
+      console.warn(`Skipped (missing): ${path}`);
+      continue;
+    }
+    const changes = transforms.reduce(
+      (total, transform) => total + transform(sourceFile),
+      0,
+    );
+    console.log(
+      changes > 0 ? `Fixed: ${path} (${changes} changes)` : `Unchanged: ${path}`,
+    );
+  }
+
+  // save() only writes source files whose text actually changed.
+  project.saveSync();
+  return 0;
+}
+
+process.exit(main());
@@ -0,0 +1,77 @@
+#!/usr/bin/env python3
+"""In-process content store shared by the fixer passes.
+
+When fixer passes are chained in CI, the same file (error-handler.ts,
+security-filter.ts) is loaded and saved repeatedly.  The bytes stay in the
+kernel page cache either way, but every re-read still pays a UTF-8 decode
+and every re-write an encode plus an inode/mtime update.  This store keeps
+decoded content in an LRU and skips saves whose content is unchanged, so a
+no-op pass costs one C-level string compare instead of a write.
+"""
+
+import os
+from functools import lru_cache
+from pathlib import Path
+from threading import Lock
+
+# Last content known to be on disk, used for the dirty check on save.
+# Guarded by a lock because the driver processes files from a thread pool.
+_last = {}
+_lock = Lock()
+
+
+@lru_cache(maxsize=64)
+def load(path: Path) -> str:
+    """Read `path` as UTF-8 with a single binary read, memoized per path.
+
+    Hints POSIX_FADV_SEQUENTIAL before reading so the kernel readahead
+    covers the whole file on the first pass (matters on cold NFS; free on
+    a warm page cache)."""
+    fd = os.open(path, os.O_RDONLY | os.O_CLOEXEC)
+    try:
+        if hasattr(os, "posix_fadvise"):
+            os.posix_fadvise(fd, 0, 0, os.POSIX_FADV_SEQUENTIAL)
+        size = os.fstat(fd).st_size
+        chunks = []
+        remaining = size
+        while remaining > 0:
+            chunk = os.read(fd, remaining)
+            if not chunk:
+                break
+            chunks.append(chunk)
+            remaining -= len(chunk)
+        content = b"".join(chunks).decode("utf-8")
+    finally:
+        os.close(fd)
+    with _lock:
+        _last[path] = content
+    return content
+
+
+def save(path: Path, content: str) -> bool:
+    """Write `content` to `path` unless it matches what is already on disk.
+
+    Returns True if the file was written.  Writes go through a raw fd
+    (O_WRONLY|O_TRUNC|O_CLOEXEC + os.write), skipping the buffered-writer
+    layers of `open(path, 'w')`."""
+    with _lock:
+        if _last.get(path) == content:
+            return False
+    data = memoryview(content.encode("utf-8"))
+    fd = os.open(path, os.O_WRONLY | os.O_TRUNC | os.O_CLOEXEC)
+    try:
+        while data:
+            written = os.write(fd, data)
+            data = data[written:]
+        # The TypeScript compiler re-reads these files through its own
+        # buffers; drop our pages rather than letting them crowd the cache.
+        if hasattr(os, "posix_fadvise"):
+            os.posix_fadvise(fd, 0, 0, os.POSIX_FADV_DONTNEED)
+    finally:
+        os.close(fd)
+    with _lock:
+        _last[path] = content
+    # The memoized load() entry for this path is now stale; drop the cache
+    # so a later load re-reads from disk.
+    load.cache_clear()
+    return True